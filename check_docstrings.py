@@ -1,22 +1,34 @@
 import ast
 import re
-import importlib
-import inspect
+import sys
 from dataclasses import dataclass
+from pathlib import Path
 
 
+# bytes pattern, so the reference does not need to be decoded as a whole
 PATTERN_DIRECTIVE = re.compile(
-    r"^(?P<indentation> *)\.\. (?P<type>\w+):: (?P<name>\w+)(?P<signature>\(.+\)(?: -> .+)?)?",
+    rb"^(?P<indentation> *)\.\. (?P<type>\w+):: (?P<name>\w+)(?P<signature>\(.+\)(?: -> .+)?)?",
     flags=re.MULTILINE,
 )
-PATTERN_SIGNATURE = re.compile(
-    r"^(?P<indentation> *)def (?P<name>\w+)(?P<signature>\(.+\)(?: -> .+)?):",
-    flags=re.MULTILINE,
-)
-PATTERN_RST_PREFIX = re.compile(r":\w+:`")
 PATTERN_SHORT_REFERENCE = re.compile(r"~(\w+\.)+")
-PATTERN_SIMPLIFY_DOCSTRING = re.compile(r"[\W\s]")
+# short references and RST role prefixes, removed in a single pass
+PATTERN_SIMPLIFY_DOCSTRING = re.compile(r"(?P<short>~(?:\w+\.)+)|(?P<rst>:\w+:`)")
 PATTERN_MAGIC_METHOD = re.compile(r"\w+\.__[a-zA-Z0-9]+__")
+REFERENCE_PATH = Path("doc/source/api_reference.rst")
+STUB_PATH = Path("ducer/_fst.pyi")
+
+
+# str.translate table that deletes the same characters as r"[\W\s]",
+# filled in lazily as characters are encountered
+class NonWordTable(dict):
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        value = codepoint if char.isalnum() or char == "_" else None
+        self[codepoint] = value
+        return value
+
+
+NON_WORD_TABLE = NonWordTable()
 
 
 @dataclass
@@ -29,53 +41,63 @@ class Item:
     doc_start: int | None
     doc_end: int | None
     docstring: str | None
+    simplified_docstring: str | None = None
+    simplified_signature: str | None = None
+
+
+def close_reference_item(item, reference, doc_end, current_class):
+    # TODO should check minimum indentation level in docstring
+    item.doc_end = doc_end
+    item.docstring = reference[item.doc_start:doc_end].decode("utf-8")
+    # fix names of methods/attributes
+    if item.type == "class":
+        return item.name
+    elif item.type in ("attribute", "method", "classmethod"):
+        if current_class is None:
+            raise SyntaxError(f"{item} must be part of a class")
+        item.name = sys.intern(f"{current_class}.{item.name}")
+        return current_class
+    return None
 
 
 def get_reference_items():
-    with open("doc/source/api_reference.rst") as f:
+    with REFERENCE_PATH.open("rb") as f:
         reference = f.read()
 
-    items = []
+    items = {}
+    current_class = None
+    previous = None
     for match in PATTERN_DIRECTIVE.finditer(reference):
-        items.append(Item(
+        # use start of next item as doc_end
+        if previous is not None:
+            current_class = close_reference_item(
+                previous, reference, match.start(), current_class
+            )
+            items[previous.name] = previous
+        signature = match.group("signature")
+        previous = Item(
             indentation=len(match.group("indentation")),
-            type=match.group("type"),
-            name=match.group("name"),
-            signature=match.group("signature"),
+            type=match.group("type").decode("ascii"),
+            name=sys.intern(match.group("name").decode("ascii")),
+            signature=None if signature is None else signature.decode("utf-8"),
             start=match.start(),
             doc_start=match.end(),
             doc_end=None,
             docstring=None,
-        ))
-
-    # use start of next item as doc_end
-    for i1, i2 in zip(items, items[1:]):
-        i1.doc_end = i2.start
+        )
     # last item has docstring until end of text
-    items[-1].doc_end = len(reference)
+    if previous is not None:
+        close_reference_item(previous, reference, len(reference), current_class)
+        items[previous.name] = previous
 
-    # add docstrings, fix names of methods/attributes
-    current_class = None
-    for item in  items:
-        # TODO should check minimum indentation level in docstring
-        item.docstring = reference[item.doc_start:item.doc_end]
-        if item.type == "class":
-            current_class = item.name
-        elif item.type in ("attribute", "method", "classmethod"):
-            if current_class is None:
-                raise SyntaxError(f"{item} must be part of a class")
-            item.name = f"{current_class}.{item.name}"
-        else:
-            current_class = None
-
-    return {item.name: item for item in items}
+    return items
 
 
 def make_stub_item_assign(prefix, node, docstring):
     return Item(
         indentation=None,
         type=None,
-        name=prefix + node.targets[0].id,
+        name=sys.intern(prefix + node.targets[0].id),
         signature=None,
         start=None,
         doc_start=None,
@@ -84,63 +106,82 @@ def make_stub_item_assign(prefix, node, docstring):
     )
 
 
+def get_raw_docstring(node):
+    # like ast.get_docstring, but without cleaning the docstring,
+    # indentation is removed by simplify_docstring anyway
+    if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Module)):
+        return None
+    body = node.body
+    if (
+        body
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    ):
+        return body[0].value.value
+    return None
+
+
 def make_stub_item(prefix, node):
     signature = None
-    try:
-        code = ast.unparse(node)
-        match = PATTERN_SIGNATURE.search(code)
-        signature = match.group("signature")
-    except AttributeError:
-        pass
-    docstring = None
-    try:
-        docstring = ast.get_docstring(node)
-    except TypeError:
-        docstring = None
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        # unparse only the signature, not the whole function
+        signature = f"({ast.unparse(node.args)})"
+        if node.returns is not None:
+            signature += f" -> {ast.unparse(node.returns)}"
     return Item(
         indentation=None,
         type=None,
-        name=prefix + node.name,
+        name=sys.intern(prefix + node.name),
         signature=signature,
         start=None,
         doc_start=None,
         doc_end=None,
-        docstring=docstring,
+        docstring=get_raw_docstring(node),
     )
 
 
 def get_stub_items():
-    with open("ducer/_fst.pyi", 'r') as f:
+    with STUB_PATH.open("rb") as f:
         pyi_content = f.read()
+    return parse_stub_items(pyi_content)
+
+
+def walk_stub(prefix, nodes):
+    for node in nodes:
+        yield prefix, node
+        if isinstance(node, ast.ClassDef):
+            yield from walk_stub(prefix + node.name + ".", node.body)
+
+
+def parse_stub_items(pyi_content):
     items = []
     tree = ast.parse(pyi_content)
-    todo = [("", child) for child in ast.iter_child_nodes(tree)]
-    previous_value = None
-    while todo:
-        prefix, node = todo.pop()
-        if prefix == "Op.":
-            pass
-        # remember orphaned values
-        if isinstance(node, ast.Expr):
-            previous_value = node.value.value
-        # handle class variables
-        if isinstance(node, ast.Assign):
-            items.append(make_stub_item_assign(prefix, node, previous_value))
-            previous_value = None
-            continue
+    previous_assign = None
+    for prefix, node in walk_stub("", tree.body):
+        # class variables and their docstrings only exist inside classes
+        if prefix:
+            # values that directly follow class variables are their docstrings
+            if isinstance(node, ast.Expr):
+                if previous_assign is not None:
+                    previous_assign.docstring = node.value.value
+                previous_assign = None
+                continue
+            previous_assign = None
+            # handle class variables
+            if isinstance(node, ast.Assign):
+                previous_assign = make_stub_item_assign(prefix, node, None)
+                items.append(previous_assign)
+                continue
         if not hasattr(node, "name"):
             continue
-        try:
-            items.append(make_stub_item(prefix, node))
-        except TypeError:
-            continue
-        prefix += node.name + "."
-        if isinstance(node, (ast.ClassDef)):
-            todo.extend((prefix, child) for child in ast.iter_child_nodes(node))
+        items.append(make_stub_item(prefix, node))
     return {item.name: item for item in items}
 
 
 def make_module_item(prefix, obj):
+    import inspect
+
     signature = None
     try:
         signature = str(inspect.signature(obj))
@@ -149,7 +190,7 @@ def make_module_item(prefix, obj):
     return Item(
         indentation=None,
         type=None,
-        name=prefix + obj.__name__,
+        name=sys.intern(prefix + obj.__name__),
         signature=signature,
         start=None,
         doc_start=None,
@@ -159,6 +200,9 @@ def make_module_item(prefix, obj):
 
 
 def get_module_items():
+    import importlib
+    import inspect
+
     module = importlib.import_module("ducer._fst")
     items = []
     for top_name, obj in inspect.getmembers(module):
@@ -168,30 +212,36 @@ def get_module_items():
             pass
         if inspect.isclass(obj):
             prefix = top_name + "."
-            for _, obj in inspect.getmembers(obj):
+            # only attributes defined by the class itself, which
+            # avoids a dir() scan that includes inherited members
+            for attr_name in vars(obj):
+                if attr_name.startswith("__") and attr_name.endswith("__"):
+                    continue
                 try:
-                    items.append(make_module_item(prefix, obj))
+                    items.append(make_module_item(prefix, getattr(obj, attr_name)))
                 except TypeError:
                     pass
     return {item.name: item for item in items}
 
 
 def simplify_docstring(docstring):
-    docstring, _ = PATTERN_SHORT_REFERENCE.subn("", docstring)
-    docstring, _ = PATTERN_RST_PREFIX.subn("", docstring)
-    docstring, _ = PATTERN_SIMPLIFY_DOCSTRING.subn("", docstring)
-    docstring = docstring.lower()
-    return docstring
+    docstring = PATTERN_SIMPLIFY_DOCSTRING.sub("", docstring)
+    return docstring.translate(NON_WORD_TABLE).lower()
+
+
+def get_simplified_docstring(item):
+    if item.simplified_docstring is None:
+        item.simplified_docstring = simplify_docstring(item.docstring)
+    return item.simplified_docstring
 
 
 def docstrings_differ(item1, item2):
-    d1 = item1.docstring
-    d2 = item2.docstring
-    if d1 is None or d2 is None:
-        return d1 != d2
-    d1 = simplify_docstring(d1)
-    d2 = simplify_docstring(d2)
-    return d1 != d2
+    if item1.docstring is None or item2.docstring is None:
+        return item1.docstring != item2.docstring
+    # identical docstrings don't need to be simplified
+    if item1.docstring == item2.docstring:
+        return False
+    return get_simplified_docstring(item1) != get_simplified_docstring(item2)
 
 
 def simplify_signature(signature):
@@ -201,10 +251,16 @@ def simplify_signature(signature):
     return signature
 
 
+def get_simplified_signature(item):
+    if item.simplified_signature is None:
+        item.simplified_signature = simplify_signature(item.signature)
+    return item.simplified_signature
+
+
 def signatures_differ(item1, item2):
-    s1 = simplify_signature(item1.signature)
-    s2 = simplify_signature(item2.signature)
-    return s1 != s2
+    if item1.signature == item2.signature:
+        return False
+    return get_simplified_signature(item1) != get_simplified_signature(item2)
 
 
 def is_magic(name):
@@ -215,40 +271,48 @@ def main():
     reference = get_reference_items()
     stub = get_stub_items()
     module = get_module_items()
+    # collect output and write it all at once at the end
+    out = []
 
     for name, item in reference.items():
         if name not in stub:
-            print()
-            print()
-            print("#======================================")
-            print(f"#{name} missing in stub!")
+            out += [
+                "",
+                "",
+                "#======================================",
+                f"#{name} missing in stub!",
+            ]
             continue
         other = stub[name]
         if docstrings_differ(item, other):
-            print()
-            print()
-            print("#======================================")
-            print(f"#{name}: reference and stub docstrings differ")
-            print()
-            print("#reference")
-            print(item.docstring)
-            print()
-            print("#stub")
-            print(other.docstring)
+            out += [
+                "",
+                "",
+                "#======================================",
+                f"#{name}: reference and stub docstrings differ",
+                "",
+                "#reference",
+                str(item.docstring),
+                "",
+                "#stub",
+                str(other.docstring),
+            ]
         # TODO fix signature comparison for classes
         # e.g., reference is `(data: SupportsBytes)`,
         #            stub is `(self, data: SupportsBytes)`
         if item.type != "class" and signatures_differ(item, other):
-            print()
-            print()
-            print("======================================")
-            print(f"{name}: reference and stub signatures differ")
-            print()
-            print("reference")
-            print(item.signature)
-            print()
-            print("stub")
-            print(other.signature)
+            out += [
+                "",
+                "",
+                "======================================",
+                f"{name}: reference and stub signatures differ",
+                "",
+                "reference",
+                str(item.signature),
+                "",
+                "stub",
+                str(other.signature),
+            ]
 
     for name, item in stub.items():
         # workaround: don't check magic methods, Rust docstrings are not considered
@@ -257,23 +321,30 @@ def main():
         if name not in module:
             # workaround: attributes can't have docstrings
             if not name.startswith("Op."):
-                print()
-                print()
-                print("#======================================")
-                print(f"#{name} missing in module!")
+                out += [
+                    "",
+                    "",
+                    "#======================================",
+                    f"#{name} missing in module!",
+                ]
             continue
         other = module[name]
         if docstrings_differ(item, other):
-            print()
-            print()
-            print("#======================================")
-            print(f"#{name}: stub and module docstrings differ")
-            print()
-            print("#stub")
-            print(item.docstring)
-            print()
-            print("#module")
-            print(other.docstring)
+            out += [
+                "",
+                "",
+                "#======================================",
+                f"#{name}: stub and module docstrings differ",
+                "",
+                "#stub",
+                str(item.docstring),
+                "",
+                "#module",
+                str(other.docstring),
+            ]
+
+    if out:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 if __name__ == "__main__":
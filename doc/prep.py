@@ -3,13 +3,24 @@ import re
 
 
 ROOT = Path(__file__).parent.absolute()
+PATTERN_README_LINK = re.compile(
+    r"\[(?P<name>[^\]]+)\]\(https://ducer\.readthedocs\.io[^)#]*#(?P<anchor>[^)]+)\)"
+)
+
+
+def replace_readme_link(match: re.Match) -> str:
+    name = match.group("name")
+    anchor = match.group("anchor")
+    # let Sphinx fill in the title of links like [`Map`](...#Map)
+    if name == f"`{anchor}`":
+        return f"[]({anchor})"
+    return f"[{name}]({anchor})"
 
 
 def change_readme_links(path_from: Path, path_to: Path):
     with path_from.open() as f:
         content = f.read()
-    content, _ = re.subn(r"\[`(.+)`\]\(https://ducer.readthedocs.io.+#\1\)", r"[](\1)", content)
-    content, _ = re.subn(r"\[(.+)\]\(https://ducer.readthedocs.io.+#(.+)\)", r"[\1](\2)", content)
+    content = PATTERN_README_LINK.sub(replace_readme_link, content)
     with path_to.open("wt", encoding="utf-8") as f:
         f.write(content)
 
@@ -221,6 +221,9 @@ class Map:
         and write it to the given path.
         If path is ":memory:", returns a Buffer containing the map data.
         path can be str or Path.
+        Items must be sorted by key.
+        They are streamed directly into the map without buffering or sorting,
+        so building requires virtually no extra memory.
 
         Hint:
             Items can really be any sequence of length 2, but building from tuple is fastest.
@@ -231,6 +234,26 @@ class Map:
         """
         ...
 
+    @classmethod
+    def build_arrays(cls, path: str | Path, keys: SupportsBytes, key_offsets: SupportsBytes, values: SupportsBytes) -> Buffer | None:
+        """
+        Build a map from keys and values stored in contiguous buffers
+        and write it to the given path.
+        keys contains all keys concatenated in sorted order.
+        The i-th key is keys[key_offsets[i]:key_offsets[i+1]],
+        so key_offsets must contain one more element than values.
+        key_offsets and values must be buffers of unsigned 64 bit integers,
+        e.g., array.array("Q") or numpy arrays with dtype uint64.
+        If path is ":memory:", returns a Buffer containing the map data.
+        path can be str or Path.
+
+        Hint:
+            No Python objects are created for individual items,
+            which makes this considerably faster than Map.build
+            if the data is already available as arrays.
+        """
+        ...
+
     def copy(self) -> Map:
         """
         Since maps are immutable, returns self.
@@ -275,6 +298,20 @@ class Map:
         """
         ...
 
+    def contains_all(self, keys: Iterable[bytes]) -> list[bool]:
+        """
+        Returns a list of bools that indicate whether this map contains each of the given keys.
+        keys can be any iterable of bytes.
+        """
+        ...
+
+    def get_many(self, keys: Iterable[bytes], default=None) -> list[int | None]:
+        """
+        Returns a list with the value for each of the given keys if present, default otherwise.
+        keys can be any iterable of bytes.
+        """
+        ...
+
     def keys(self) -> Iterator[bytes]:
         """
         Iterate over all keys.
@@ -27,7 +27,9 @@ pub struct Buffer {
 }
 
 impl Buffer {
-    pub fn new(data: Vec<u8>) -> Self {
+    pub fn new(mut data: Vec<u8>) -> Self {
+        // builders reserve generously and the buffer is never resized
+        data.shrink_to_fit();
         Buffer { data }
     }
 }
@@ -8,10 +8,9 @@ use pyo3::{
     buffer::PyBuffer,
     exceptions::{PyIOError, PyRuntimeError, PyValueError},
     prelude::*,
-    types::{PyTuple, PyType},
+    types::{PyBytes, PyTuple, PyType},
 };
 use std::{
-    borrow::Cow,
     fs,
     io::{self, BufWriter},
     path::{Path, PathBuf},
@@ -45,9 +44,9 @@ impl KeyIterator {
         slf
     }
 
-    fn __next__(&mut self) -> Option<Cow<[u8]>> {
+    fn __next__<'py>(&mut self, py: Python<'py>) -> Option<Bound<'py, PyBytes>> {
         self.with_stream_mut(|stream| stream.next())
-            .map(|key| Cow::from(key.to_vec()))
+            .map(|key| PyBytes::new(py, key))
     }
 }
 
@@ -67,9 +66,9 @@ impl AutomatonIterator {
         slf
     }
 
-    fn __next__(&mut self) -> Option<Cow<[u8]>> {
+    fn __next__<'py>(&mut self, py: Python<'py>) -> Option<Bound<'py, PyBytes>> {
         self.with_stream_mut(|stream| stream.next())
-            .map(|key| Cow::from(key.to_vec()))
+            .map(|key| PyBytes::new(py, key))
     }
 }
 
@@ -118,13 +117,13 @@ where
         .map_err(|err| PyErr::new::<PyRuntimeError, _>(err.to_string()))
 }
 
-fn build_from_stream<'f, I, S>(path: &Path, stream: I) -> PyResult<Option<Buffer>>
+fn build_from_stream<'f, I, S>(path: &Path, stream: I, capacity: usize) -> PyResult<Option<Buffer>>
 where
     S: 'f + for<'a> Streamer<'a, Item = OpItem<'a>>,
     I: for<'a> IntoStreamer<'a, Into = S, Item = OpItem<'a>>,
 {
     if path == Path::new(":memory:") {
-        let buf = Vec::with_capacity(10 * (1 << 10));
+        let buf = Vec::with_capacity(capacity.max(10 * (1 << 10)));
         let buf = fill_from_stream(stream, buf)?;
         Ok(Some(Buffer::new(buf)))
     } else {
@@ -176,6 +175,15 @@ fn opbuilder(sets: &Vec<Arc<PySet>>) -> OpBuilder {
     builder
 }
 
+/// Size in bytes of the largest of the given sets,
+/// used as an estimate for the size of their union.
+fn max_size(sets: &[Arc<PySet>]) -> usize {
+    sets.iter()
+        .map(|set| set.as_fst().size())
+        .max()
+        .unwrap_or(0)
+}
+
 /// An immutable set of bytes keys, based on finite-state-transducers.
 /// Typically uses a fraction of the memory as the builtin set and can be streamed from a file.
 ///
@@ -476,8 +484,9 @@ impl Set {
     #[allow(clippy::needless_pass_by_value)]
     fn union(&self, path: PathBuf, others: &Bound<'_, PyTuple>) -> PyResult<Option<Buffer>> {
         let sets = setvec(self, others)?;
+        let capacity = max_size(&sets);
         let stream = opbuilder(&sets).union();
-        build_from_stream(&path, stream)
+        build_from_stream(&path, stream, capacity)
     }
 
     /// Build a new set that is the intersection of self and others.
@@ -490,7 +499,7 @@ impl Set {
     fn intersection(&self, path: PathBuf, others: &Bound<'_, PyTuple>) -> PyResult<Option<Buffer>> {
         let sets = setvec(self, others)?;
         let stream = opbuilder(&sets).intersection();
-        build_from_stream(&path, stream)
+        build_from_stream(&path, stream, 0)
     }
 
     /// Build a new set that is the difference between self and all others,
@@ -505,7 +514,7 @@ impl Set {
     fn difference(&self, path: PathBuf, others: &Bound<'_, PyTuple>) -> PyResult<Option<Buffer>> {
         let sets = setvec(self, others)?;
         let stream = opbuilder(&sets).difference();
-        build_from_stream(&path, stream)
+        build_from_stream(&path, stream, 0)
     }
 
     /// Build a new set that is the symmetric difference between self and others.
@@ -525,6 +534,6 @@ impl Set {
     ) -> PyResult<Option<Buffer>> {
         let sets = setvec(self, others)?;
         let stream = opbuilder(&sets).symmetric_difference();
-        build_from_stream(&path, stream)
+        build_from_stream(&path, stream, 0)
     }
 }
@@ -0,0 +1,62 @@
+import mmap
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+
+SHM_DIR = "/dev/shm"
+# advice is applied in order, so SEQUENTIAL must precede POPULATE_READ
+MMAP_ADVICE = {
+    "normal": (),
+    "sequential": ("MADV_SEQUENTIAL", "MADV_WILLNEED", "MADV_POPULATE_READ"),
+    "random": ("MADV_RANDOM",),
+}
+
+
+@pytest.fixture
+def fast_tmp_path(request):
+    """Temporary directory in shared memory if available, else tmp_path."""
+    if not (os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK)):
+        yield request.getfixturevalue("tmp_path")
+        return
+    path = Path(tempfile.mkdtemp(prefix="ducer-", dir=SHM_DIR))
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def close_mmap(mm):
+    try:
+        mm.close()
+    except BufferError:
+        # a failed test's traceback still holds the Map or Set,
+        # the mapping is released once that is collected
+        pass
+
+
+@pytest.fixture(scope="session")
+def open_mmap(request):
+    """Factory for read-only mappings, closed at the latest when the session ends."""
+
+    def _open_mmap(path, access="normal"):
+        with open(path, "rb") as fp:
+            mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        # pytest keeps the arguments of the last test alive through module
+        # teardown, so close only once every Map or Set is gone
+        request.config.add_cleanup(lambda: close_mmap(mm))
+        # constants are platform-dependent and the running kernel may still
+        # reject them (POPULATE_READ needs Linux 5.14), skip those
+        for name in MMAP_ADVICE[access]:
+            if hasattr(mmap, name):
+                try:
+                    mm.madvise(getattr(mmap, name))
+                except OSError:
+                    pass
+        return mm
+
+    return _open_mmap
+
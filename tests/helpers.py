@@ -0,0 +1,38 @@
+"""Constants and helpers shared by the map and set tests."""
+
+import itertools
+
+from ducer import Automaton
+
+
+# distinct from any item, so length mismatches fail comparisons
+MISSING = object()
+
+K1 = b"key1"
+K2 = b"key2"
+K3 = b"key3"
+KO = b"other"
+
+# automata are modified in place by complement, starts_with, etc.,
+# so every constant is constructed independently
+A_ALWAYS = Automaton.always()
+A_ALWAYS_COMPLEMENT = Automaton.always().complement()
+A_NEVER = Automaton.never()
+A_NEVER_COMPLEMENT = Automaton.never().complement()
+A_STR_K1 = Automaton.str(K1)
+A_STR_K1_COMPLEMENT = Automaton.str(K1).complement()
+A_SUBSEQUENCE_K1 = Automaton.subsequence(b"k1")
+A_SUBSEQUENCE_K1_COMPLEMENT = Automaton.subsequence(b"k1").complement()
+A_HAMMING_K2_0 = Automaton.hamming_subsequence(b"k2", 0)
+A_HAMMING_K2_0_COMPLEMENT = Automaton.hamming_subsequence(b"k2", 0).complement()
+A_HAMMING_K2_1 = Automaton.hamming_subsequence(b"k2", 1)
+A_HAMMING_K2_1_COMPLEMENT = Automaton.hamming_subsequence(b"k2", 1).complement()
+A_STARTS_WITH_KEY = Automaton.str(b"key").starts_with()
+A_STARTS_WITH_KEY_COMPLEMENT = Automaton.str(b"key").starts_with().complement()
+A_STR_K1_OR_STARTS_WITH_OTH = Automaton.str(K1).union(Automaton.str(b"oth").starts_with())
+A_NOT_K1_AND_NOT_K3 = Automaton.str(K1).complement().intersection(Automaton.str(K3).complement())
+
+
+def take(iterator, n):
+    # one extra item is enough to tell whether there are more than n
+    return tuple(itertools.islice(iterator, n + 1))
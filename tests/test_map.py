@@ -1,27 +1,48 @@
 from __future__ import annotations
 
-import contextlib
-import mmap
+import itertools
+import random
+from array import array
 from pathlib import Path
 
 import pytest
 
 from ducer import Automaton, Map, Op
+from helpers import (
+    K1,
+    K2,
+    K3,
+    KO,
+    MISSING,
+    A_ALWAYS,
+    A_ALWAYS_COMPLEMENT,
+    A_HAMMING_K2_0,
+    A_HAMMING_K2_0_COMPLEMENT,
+    A_HAMMING_K2_1,
+    A_HAMMING_K2_1_COMPLEMENT,
+    A_NEVER,
+    A_NEVER_COMPLEMENT,
+    A_NOT_K1_AND_NOT_K3,
+    A_STARTS_WITH_KEY,
+    A_STARTS_WITH_KEY_COMPLEMENT,
+    A_STR_K1,
+    A_STR_K1_COMPLEMENT,
+    A_STR_K1_OR_STARTS_WITH_OTH,
+    A_SUBSEQUENCE_K1,
+    A_SUBSEQUENCE_K1_COMPLEMENT,
+    take,
+)
 
 
-K1 = b"key1"
 V1 = 123
 I1 = K1, V1
 
-K2 = b"key2"
 V2 = 456
 I2 = K2, V2
 
-K3 = b"key3"
 V3 = 789
 I3 = K3, V3
 
-KO = b"other"
 VO = 123456789
 IO = KO, VO
 
@@ -29,44 +50,69 @@ DICT12 = dict((I1, I2))
 DICT123 = dict((I1, I2, I3))
 DICT23 = dict((I2, I3))
 DICT12O = dict((I1, I2, IO))
+DICT12_KEYS = frozenset(DICT12)
 
+ITEMS12 = tuple(sorted(DICT12.items()))
+ITEMS123 = tuple(sorted(DICT123.items()))
+ITEMS23 = tuple(sorted(DICT23.items()))
+ITEMS12O = tuple(sorted(DICT12O.items()))
+KEYS12 = tuple(k for k, _ in ITEMS12)
+VALUES12 = tuple(v for _, v in ITEMS12)
 
-def build_map(source=DICT12, path: str | Path = ":memory:"):
-    return Map.build(path, source.items())
 
+def build_map(items=ITEMS12, path: str | Path = ":memory:"):
+    # items must be sorted by key
+    return Map.build(path, items)
 
-def create_map(source=DICT12):
-    return Map(build_map(source=source))
 
+def create_map(items=ITEMS12):
+    return Map(build_map(items=items))
 
-def validate_map(s, source=DICT12):
-    for k in source:
-        assert k in s
-    for k in s:
-        assert k in source
 
+@pytest.fixture(scope="module")
+def map12():
+    return create_map(ITEMS12)
+
+
+@pytest.fixture(scope="module")
+def map123():
+    return create_map(ITEMS123)
+
+
+@pytest.fixture(scope="module")
+def map23():
+    return create_map(ITEMS23)
 
-def validate_map_file(path, source=DICT12):
-    with open(path, "rb") as f:
-        data = f.read()
-    s = Map(data)
-    validate_map(s, source=source)
+
+@pytest.fixture(scope="module")
+def map12o():
+    return create_map(ITEMS12O)
+
+
+def validate_map(s, keys=DICT12_KEYS):
+    assert frozenset(s) == keys
+
+
+def validate_map_file(open_mmap, path, keys=DICT12_KEYS):
+    mm = open_mmap(path)
+    validate_map(Map(mm), keys=keys)
+    mm.close()
 
 
 def test_map_build_memory():
     validate_map(create_map())
 
 
-def test_map_build_str(tmp_path):
-    path = str(tmp_path / "test.map")
+def test_map_build_str(open_mmap, fast_tmp_path):
+    path = str(fast_tmp_path / "test.map")
     build_map(path=path)
-    validate_map_file(path)
+    validate_map_file(open_mmap, path)
 
 
-def test_map_build_path(tmp_path):
-    path = Path(tmp_path / "test.map")
+def test_map_build_path(open_mmap, fast_tmp_path):
+    path = Path(fast_tmp_path / "test.map")
     build_map(path=path)
-    validate_map_file(path)
+    validate_map_file(open_mmap, path)
 
 
 def test_map_build_not_bytes():
@@ -89,402 +135,345 @@ def test_map_build_too_large():
         Map.build(":memory:", [(b"key", 2**64)])
 
 
-def test_map_build_buffer_file(tmp_path):
-    path = tmp_path / "test.map"
+def test_map_build_buffer_file(fast_tmp_path):
+    path = fast_tmp_path / "test.map"
     build_map(path=path)
     with open(path, "rb") as f:
         data = f.read()
     validate_map(Map(data))
 
 
-@contextlib.contextmanager
-def init_mmap(tmp_path):
-    path = tmp_path / "test.map"
+def build_arrays(items=ITEMS12):
+    keys = b"".join(k for k, _ in items)
+    key_offsets = array("Q", itertools.accumulate((len(k) for k, _ in items), initial=0))
+    values = array("Q", (v for _, v in items))
+    return keys, key_offsets, values
+
+
+def test_map_build_arrays():
+    validate_map(Map(Map.build_arrays(":memory:", *build_arrays())))
+
+
+def test_map_build_arrays_path(open_mmap, fast_tmp_path):
+    path = fast_tmp_path / "test.map"
+    Map.build_arrays(path, *build_arrays())
+    validate_map_file(open_mmap, path)
+
+
+def test_map_build_arrays_offsets_length():
+    keys, key_offsets, values = build_arrays()
+    with pytest.raises(ValueError):
+        Map.build_arrays(":memory:", keys, key_offsets[:-1], values)
+
+
+def test_map_build_arrays_offsets_out_of_bounds():
+    keys, key_offsets, values = build_arrays()
+    key_offsets[-1] += 1
+    with pytest.raises(ValueError):
+        Map.build_arrays(":memory:", keys, key_offsets, values)
+
+
+def test_map_build_arrays_unsorted():
+    keys, key_offsets, values = build_arrays(ITEMS12[::-1])
+    with pytest.raises(ValueError):
+        Map.build_arrays(":memory:", keys, key_offsets, values)
+
+
+def test_map_build_arrays_wrong_type():
+    keys, key_offsets, values = build_arrays()
+    with pytest.raises(BufferError):
+        Map.build_arrays(":memory:", keys, array("I", key_offsets), values)
+    with pytest.raises(BufferError):
+        Map.build_arrays(":memory:", keys, key_offsets, array("I", values))
+
+
+@pytest.fixture(scope="module")
+def map_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ducer") / "test.map"
     build_map(path=path)
-    with open(path, "rb") as fp:
-        mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
-        yield Map(mm)
+    return path
 
 
-def test_map_init_mmap(tmp_path):
-    with init_mmap(tmp_path) as m:
-        pass
+@pytest.fixture(scope="module")
+def mmap_map_seq(open_mmap, map_file):
+    return Map(open_mmap(map_file, "sequential"))
 
 
-def test_map_len_memory():
-    m = create_map()
-    assert len(m) == 2
+@pytest.fixture(scope="module")
+def mmap_map_rand(open_mmap, map_file):
+    return Map(open_mmap(map_file, "random"))
 
 
-def test_map_len_mmap(tmp_path):
-    with init_mmap(tmp_path) as m:
-        assert len(m) == 2
+def test_map_init_mmap(mmap_map_rand):
+    pass
 
 
-def test_map_contains():
-    m = create_map()
-    for k in DICT12:
-        assert k in m
-    assert K3 not in m
+def test_map_len_memory(map12):
+    assert len(map12) == 2
 
 
-def test_map_getitem_contained():
-    m = create_map()
-    for k, v in DICT12.items():
-        assert m[k] == v
+def test_map_len_mmap(mmap_map_rand):
+    assert len(mmap_map_rand) == 2
 
 
-def test_map_getitem_missing():
-    m = create_map()
-    with pytest.raises(KeyError):
-        m[K3]
+def test_map_contains(map12):
+    for k in DICT12:
+        assert k in map12
+    assert K3 not in map12
 
 
-def test_map_get_contained():
-    m = create_map()
+def test_map_getitem_contained(map12):
     for k, v in DICT12.items():
-        assert m.get(k) == v
+        assert map12[k] == v
 
 
-def test_map_get_contained_default():
-    m = create_map()
+def test_map_getitem_mmap(mmap_map_rand):
     for k, v in DICT12.items():
-        assert m.get(k, default=17) == v
+        assert mmap_map_rand[k] == v
 
 
-def test_map_get_missing():
-    m = create_map()
-    assert m.get(K3) is None
+def test_map_getitem_missing(map12):
+    with pytest.raises(KeyError):
+        map12[K3]
 
 
-def test_map_get_missing_default():
-    m = create_map()
-    assert m.get(K3, 17) == 17
+def test_map_get_contained(map12):
+    for k, v in DICT12.items():
+        assert map12.get(k) == v
 
 
-def test_map_iter():
-    m = create_map()
-    for k1, k2 in zip(m, sorted(DICT12)):
-        assert k1 == k2
+def test_map_get_contained_default(map12):
+    for k, v in DICT12.items():
+        assert map12.get(k, default=17) == v
 
 
-def test_map_iter_mmap(tmp_path):
-    with init_mmap(tmp_path) as m:
-        for k1, k2 in zip(m, sorted(DICT12)):
-            assert k1 == k2
+def test_map_get_missing(map12):
+    assert map12.get(K3) is None
 
 
-def test_map_keys():
-    m = create_map()
-    for k1, k2 in zip(m.keys(), sorted(DICT12)):
-        assert k1 == k2
+def test_map_get_missing_default(map12):
+    assert map12.get(K3, 17) == 17
 
 
-def test_map_values():
-    m = create_map()
-    for v1, v2 in zip(m.values(), (v for _, v in sorted(DICT12.items()))):
-        assert v1 == v2
+def test_map_contains_all(map12):
+    assert map12.contains_all([K1, K3, K2]) == [True, False, True]
 
 
-def test_map_items():
-    m = create_map()
-    for i1, i2 in zip(m.items(), sorted(DICT12.items())):
-        assert i1 == i2
+def test_map_contains_all_empty(map12):
+    assert map12.contains_all(iter(())) == []
 
 
-def test_map_range():
-    m = create_map()
-    for i1, i2 in zip(m.range(), sorted(DICT12.items())):
-        assert i1 == i2
+def test_map_contains_all_not_bytes(map12):
+    with pytest.raises(TypeError):
+        map12.contains_all(["key"])
 
 
-def test_map_range_lt():
-    m = create_map()
-    items = list(m.range(lt=K2))
-    assert I1 in items
-    assert I2 not in items
+def test_map_get_many(map12):
+    assert map12.get_many([K1, K3, K2]) == [V1, None, V2]
 
 
-def test_map_range_le():
-    m = create_map()
-    items = list(m.range(le=K1))
-    assert I1 in items
-    assert I2 not in items
+def test_map_get_many_default(map12):
+    assert map12.get_many([K1, K3, K2], default=17) == [V1, 17, V2]
 
 
-def test_map_range_gt():
-    m = create_map()
-    items = list(m.range(gt=K1))
-    assert I1 not in items
-    assert I2 in items
+def test_map_iter(map12):
+    for k1, k2 in itertools.zip_longest(map12, KEYS12, fillvalue=MISSING):
+        assert k1 == k2
 
 
-def test_map_range_ge():
-    m = create_map()
-    items = list(m.range(ge=K2))
-    assert I1 not in items
-    assert I2 in items
+def test_map_iter_mmap(mmap_map_seq):
+    for k1, k2 in itertools.zip_longest(mmap_map_seq, KEYS12, fillvalue=MISSING):
+        assert k1 == k2
 
 
-def test_map_range_lt_gt():
-    m = create_map()
-    items = list(m.range(lt=K2, gt=K1))
-    assert not items
+def test_map_keys(map12):
+    for k1, k2 in itertools.zip_longest(map12.keys(), KEYS12, fillvalue=MISSING):
+        assert k1 == k2
 
 
-def test_map_range_le_gt():
-    m = create_map()
-    items = list(m.range(le=K2, gt=K1))
-    assert I1 not in items
-    assert I2 in items
+def test_map_values(map12):
+    for v1, v2 in itertools.zip_longest(map12.values(), VALUES12, fillvalue=MISSING):
+        assert v1 == v2
 
 
-def test_map_range_lt_ge():
-    m = create_map()
-    items = list(m.range(lt=K2, ge=K1))
-    assert I1 in items
-    assert I2 not in items
+def test_map_items(map12):
+    for i1, i2 in itertools.zip_longest(map12.items(), ITEMS12, fillvalue=MISSING):
+        assert i1 == i2
+
 
+def test_map_range(map12):
+    for i1, i2 in itertools.zip_longest(map12.range(), ITEMS12, fillvalue=MISSING):
+        assert i1 == i2
 
-def test_map_search_always():
-    m = create_map()
-    a = Automaton.always()
-    items = list(m.search(a))
-    for i in DICT12.items():
-        assert i in items
 
+@pytest.mark.parametrize("kwargs,expected", [
+    (dict(lt=K2), (I1,)),
+    (dict(le=K1), (I1,)),
+    (dict(gt=K1), (I2,)),
+    (dict(ge=K2), (I2,)),
+    (dict(lt=K2, gt=K1), ()),
+    (dict(le=K2, gt=K1), (I2,)),
+    (dict(lt=K2, ge=K1), (I1,)),
+])
+def test_map_range_bounds(map12, kwargs, expected):
+    assert take(map12.range(**kwargs), len(expected)) == expected
+
+
+@pytest.mark.parametrize("source,automaton,expected", [
+    pytest.param("map12", A_ALWAYS, (I1, I2), id="always"),
+    pytest.param("map12", A_ALWAYS_COMPLEMENT, (), id="always_complement"),
+    pytest.param("map12", A_NEVER, (), id="never"),
+    pytest.param("map12", A_NEVER_COMPLEMENT, (I1, I2), id="never_complement"),
+    pytest.param("map12", A_STR_K1, (I1,), id="str"),
+    pytest.param("map12", A_STR_K1_COMPLEMENT, (I2,), id="str_complement"),
+    pytest.param("map12", A_SUBSEQUENCE_K1, (I1,), id="subsequence"),
+    pytest.param("map12", A_SUBSEQUENCE_K1_COMPLEMENT, (I2,), id="subsequence_complement"),
+    pytest.param("map123", A_HAMMING_K2_0, (I2,), id="hamming_subsequence_0"),
+    pytest.param("map123", A_HAMMING_K2_1, (I2, I3), id="hamming_subsequence_1"),
+    pytest.param("map123", A_HAMMING_K2_0_COMPLEMENT, (I1, I3), id="hamming_subsequence_0_complement"),
+    pytest.param("map123", A_HAMMING_K2_1_COMPLEMENT, (I1,), id="hamming_subsequence_1_complement"),
+    pytest.param("map12o", A_STARTS_WITH_KEY, (I1, I2), id="starts_with"),
+    pytest.param("map12o", A_STARTS_WITH_KEY_COMPLEMENT, (IO,), id="starts_with_complement"),
+    pytest.param("map12o", A_STR_K1_OR_STARTS_WITH_OTH, (I1, IO), id="union"),
+    pytest.param("map123", A_NOT_K1_AND_NOT_K3, (I2,), id="intersection"),
+])
+def test_map_search(request, source, automaton, expected):
+    m = request.getfixturevalue(source)
+    assert tuple(m.search(automaton)) == expected
+
+
+def test_map_difference(map123, map23):
+    m = Map(map123.difference(":memory:", map23))
+    items = set(m.items())
+    assert I1 in items and items.isdisjoint((I2, I3))
+
+
+def test_map_intersection(map12, map23):
+    m = Map(map12.intersection(":memory:", map23))
+    items = set(m.items())
+    assert I2 in items and items.isdisjoint((I1, I3))
+
+
+def test_map_symmetric_difference(map12, map23):
+    m = Map(map12.symmetric_difference(":memory:", map23))
+    items = set(m.items())
+    assert {I1, I3} <= items and I2 not in items
+
+
+def test_map_union(map12, map23):
+    m = Map(map12.union(":memory:", map23))
+    items = set(m.items())
+    assert {I1, I2, I3} <= items
+
+
+@pytest.fixture(scope="module")
+def large_maps():
+    rng = random.Random(42)
+    keys = [b"%08x" % rng.getrandbits(28) for _ in range(20000)]
+    source1 = {k: i for i, k in enumerate(keys[:12000])}
+    source2 = {k: i for i, k in enumerate(keys[8000:])}
+    return (
+        source1,
+        source2,
+        create_map(tuple(sorted(source1.items()))),
+        create_map(tuple(sorted(source2.items()))),
+    )
 
-def test_map_search_always_complement():
-    m = create_map()
-    a = Automaton.always().complement()
-    items = list(m.search(a))
-    assert not items
-
-
-def test_map_search_never():
-    m = create_map()
-    a = Automaton.never()
-    items = list(m.search(a))
-    assert not items
 
-
-def test_map_search_never_complement():
-    m = create_map()
-    a = Automaton.never().complement()
-    items = list(m.search(a))
-    for i in DICT12.items():
-        assert i in items
-
-
-def test_map_search_str():
-    m = create_map()
-    a = Automaton.str(K1)
-    items = list(m.search(a))
-    assert I1 in items
-    assert I2 not in items
-
-
-def test_map_search_str_complement():
-    m = create_map()
-    a = Automaton.str(K1).complement()
-    items = list(m.search(a))
-    assert I1 not in items
-    assert I2 in items
-
-
-def test_map_search_subsequence():
-    m = create_map()
-    a = Automaton.subsequence(b"k1")
-    items = list(m.search(a))
-    assert I1 in items
-    assert I2 not in items
-
-
-def test_map_search_subsequence_complement():
-    m = create_map()
-    a = Automaton.subsequence(b"k1").complement()
-    items = list(m.search(a))
-    assert I1 not in items
-    assert I2 in items
-
-
-def test_map_search_hamming_subsequence():
-    m = create_map(DICT123)
-    a = Automaton.hamming_subsequence(b"k2", 0)
-    items = list(m.search(a))
-    assert I1 not in items
-    assert I2 in items
-    assert I3 not in items
-    a = Automaton.hamming_subsequence(b"k2", 1)
-    items = list(m.search(a))
-    assert I1 not in items
-    assert I2 in items
-    assert I3 in items
-
-
-def test_map_search_hamming_subsequence_complement():
-    m = create_map(DICT123)
-    a = Automaton.hamming_subsequence(b"k2", 0).complement()
-    items = list(m.search(a))
-    assert I1 in items
-    assert I2 not in items
-    assert I3 in items
-    a = Automaton.hamming_subsequence(b"k2", 1).complement()
-    items = list(m.search(a))
-    assert I1 in items
-    assert I2 not in items
-    assert I3 not in items
-
-
-def test_map_search_starts_with():
-    m = create_map(source=DICT12O)
-    a = Automaton.str(b"key").starts_with()
-    items = list(m.search(a))
-    assert I1 in items
-    assert I2 in items
-    assert IO not in items
-
-
-def test_map_search_starts_with_complement():
-    m = create_map(source=DICT12O)
-    a = Automaton.str(b"key").starts_with().complement()
-    items = list(m.search(a))
-    assert I1 not in items
-    assert I2 not in items
-    assert IO in items
-
-
-def test_map_search_union():
-    m = create_map(source=DICT12O)
-    a1 = Automaton.str(K1)
-    a2 = Automaton.str(b"oth").starts_with()
-    a = a1.union(a2)
-    items = list(m.search(a))
-    assert I1 in items
-    assert I2 not in items
-    assert IO in items
-
-
-def test_map_search_intersection():
-    m = create_map(source=DICT123)
-    a1 = Automaton.str(K1).complement()
-    a2 = Automaton.str(K3).complement()
-    a = a1.intersection(a2)
-    items = list(m.search(a))
-    assert I1 not in items
-    assert I2 in items
-    assert I3 not in items
-
-
-def test_map_difference():
-    m1 = create_map(source=DICT123)
-    m2 = create_map(source=DICT23)
-    m = Map(m1.difference(":memory:", m2))
-    items = list(m.items())
-    assert I1 in items
-    assert I2 not in items
-    assert I3 not in items
-
-
-def test_map_intersection():
-    m1 = create_map(source=DICT12)
-    m2 = create_map(source=DICT23)
-    m = Map(m1.intersection(":memory:", m2))
-    items = list(m.items())
-    assert I1 not in items
-    assert I2 in items
-    assert I3 not in items
-
-
-def test_map_symmetric_difference():
-    m1 = create_map(source=DICT12)
-    m2 = create_map(source=DICT23)
-    m = Map(m1.symmetric_difference(":memory:", m2))
-    items = list(m.items())
-    assert I1 in items
-    assert I2 not in items
-    assert I3 in items
-
-
-def test_map_union():
-    m1 = create_map(source=DICT12)
-    m2 = create_map(source=DICT23)
-    m = Map(m1.union(":memory:", m2))
-    items = list(m.items())
-    assert I1 in items
-    assert I2 in items
-    assert I3 in items
-
-
-def op_test_maps():
+def test_map_contains_all_large(large_maps):
+    source1, source2, m1, _ = large_maps
+    # head of source2 overlaps source1, its tail does not
+    probes = list(source2)[:50] + list(source2)[-50:]
+    expected = [k in source1 for k in probes]
+    assert True in expected and False in expected
+    assert m1.contains_all(probes) == expected
+
+
+@pytest.mark.parametrize("op", [
+    "union",
+    "intersection",
+    "difference",
+    "symmetric_difference",
+])
+def test_map_op_large(large_maps, op):
+    source1, source2, m1, m2 = large_maps
+    m = Map(getattr(m1, op)(":memory:", m2, select=Op.Max))
+    keys = list(m)
+    assert keys == sorted(getattr(set(source1), op)(source2))
+    for k, v in m.items():
+        assert v == max(source1.get(k, 0), source2.get(k, 0))
+
+
+@pytest.fixture(scope="module")
+def op_maps():
     return (
-        Map(Map.build(":memory:", {K1: V1}.items())),
-        Map(Map.build(":memory:", {K1: V2}.items())),
-        Map(Map.build(":memory:", {K1: V3}.items())),
+        create_map(((K1, V1),)),
+        create_map(((K1, V2),)),
+        create_map(((K1, V3),)),
     )
 
 
-def test_map_union_multiple_first():
-    m1, *ms = op_test_maps()
+def test_map_union_multiple_first(op_maps):
+    m1, *ms = op_maps
     m = Map(m1.union(":memory:", *ms, select=Op.First))
     assert m[K1] == V1
 
 
-def test_map_union_multiple_mid():
-    m1, *ms = op_test_maps()
+def test_map_union_multiple_mid(op_maps):
+    m1, *ms = op_maps
     m = Map(m1.union(":memory:", *ms, select=Op.Mid))
     assert m[K1] == V2
 
 
-def test_map_union_multiple_last():
-    m1, *ms = op_test_maps()
+def test_map_union_multiple_last(op_maps):
+    m1, *ms = op_maps
     m = Map(m1.union(":memory:", *ms, select=Op.Last))
     assert m[K1] == V3
 
 
-def test_map_union_multiple_min():
-    m1, *ms = op_test_maps()
+def test_map_union_multiple_min(op_maps):
+    m1, *ms = op_maps
     m = Map(m1.union(":memory:", *ms, select=Op.Min))
     assert m[K1] == V1
 
 
-def test_map_union_multiple_avg():
-    m1, *ms = op_test_maps()
+def test_map_union_multiple_avg(op_maps):
+    m1, *ms = op_maps
     m = Map(m1.union(":memory:", *ms, select=Op.Avg))
     assert m[K1] == (V1 + V2 + V3) // 3
 
 
-def test_map_union_multiple_max():
-    m1, *ms = op_test_maps()
+def test_map_union_multiple_max(op_maps):
+    m1, *ms = op_maps
     m = Map(m1.union(":memory:", *ms, select=Op.Max))
     assert m[K1] == V3
 
 
-def test_map_union_multiple_median_odd():
-    m1, *ms = op_test_maps()
+def test_map_union_multiple_median_odd(op_maps):
+    m1, *ms = op_maps
     m = Map(m1.union(":memory:", *ms, select=Op.Median))
     assert m[K1] == V2
 
 
-def test_map_union_multiple_median_even():
-    m1, m2, _ = op_test_maps()
+def test_map_union_multiple_median_even(op_maps):
+    m1, m2, _ = op_maps
     m = Map(m1.union(":memory:", m2, select=Op.Median))
     assert m[K1] == (V1 + V2) // 2
 
 
 def test_map_eq_true():
-    s1 = create_map(source=DICT12)
-    s2 = create_map(source=DICT12)
+    s1 = create_map(ITEMS12)
+    s2 = create_map(ITEMS12)
     assert s1 == s2
 
 
 def test_map_eq_false():
-    s1 = create_map(source=DICT12)
-    s2 = create_map(source=DICT123)
+    s1 = create_map(ITEMS12)
+    s2 = create_map(ITEMS123)
     assert s1 != s2
     assert s2 != s1
-    s1 = create_map(source=DICT12)
-    s2 = create_map(source=DICT23)
+    s1 = create_map(ITEMS12)
+    s2 = create_map(ITEMS23)
     assert s1 != s2
     assert s2 != s1
 
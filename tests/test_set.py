@@ -1,27 +1,46 @@
 from __future__ import annotations
 
-import contextlib
-import mmap
+import functools
+import itertools
+import operator
 from pathlib import Path
 
 import pytest
 
 from ducer import Automaton, Op, Set
+from helpers import (
+    K1,
+    K2,
+    K3,
+    KO,
+    MISSING,
+    A_ALWAYS,
+    A_ALWAYS_COMPLEMENT,
+    A_HAMMING_K2_0,
+    A_HAMMING_K2_0_COMPLEMENT,
+    A_HAMMING_K2_1,
+    A_HAMMING_K2_1_COMPLEMENT,
+    A_NEVER,
+    A_NEVER_COMPLEMENT,
+    A_NOT_K1_AND_NOT_K3,
+    A_STARTS_WITH_KEY,
+    A_STARTS_WITH_KEY_COMPLEMENT,
+    A_STR_K1,
+    A_STR_K1_COMPLEMENT,
+    A_STR_K1_OR_STARTS_WITH_OTH,
+    A_SUBSEQUENCE_K1,
+    A_SUBSEQUENCE_K1_COMPLEMENT,
+    take,
+)
 
 
-K1 = b"key1"
-K2 = b"key2"
-K3 = b"key3"
-SO = "other"
-KO = SO.encode('utf-8')
-
 SET1 = K1,
-SET12 = K1, K2
-SET123 = K1, K2, K3
+SET12 = tuple(sorted((K1, K2)))
+SET123 = tuple(sorted((K1, K2, K3)))
 SET2 = K2,
-SET23 = K2, K3
+SET23 = tuple(sorted((K2, K3)))
 SET3 = K3,
-SET12O = K1, K2, KO
+SET12O = tuple(sorted((K1, K2, KO)))
 
 
 def build_set(source=SET12, path: str | Path = ":memory:"):
@@ -32,34 +51,61 @@ def create_set(source=SET12):
     return Set(build_set(source=source))
 
 
+def multi_contains(s, keys):
+    # union modifies the automaton in place, so build a fresh one per key
+    a = functools.reduce(Automaton.union, map(Automaton.str, keys))
+    return set(s.search(a))
+
+
+@pytest.fixture(scope="module")
+def set1():
+    return create_set(SET1)
+
+
+@pytest.fixture(scope="module")
+def set12():
+    return create_set(SET12)
+
+
+@pytest.fixture(scope="module")
+def set123():
+    return create_set(SET123)
+
+
+@pytest.fixture(scope="module")
+def set23():
+    return create_set(SET23)
+
+
+@pytest.fixture(scope="module")
+def set12o():
+    return create_set(SET12O)
+
+
 def validate_set(s, source=SET12):
-    for k in source:
-        assert k in s
-    for k in s:
-        assert k in source
+    assert set(s) == set(source)
 
 
-def validate_set_file(path, source=SET12):
-    with open(path, "rb") as f:
-        data = f.read()
-    s = Set(data)
-    validate_set(s, source=source)
+def validate_set_file(open_mmap, path, source=SET12):
+    mm = open_mmap(path)
+    validate_set(Set(mm), source=source)
+    mm.close()
 
 
 def test_set_build_memory():
     validate_set(Set(build_set()))
 
 
-def test_set_build_str(tmp_path):
+def test_set_build_str(open_mmap, tmp_path):
     path = str(tmp_path / "test.set")
     build_set(path=path)
-    validate_set_file(path)
+    validate_set_file(open_mmap, path)
 
 
-def test_set_build_path(tmp_path):
+def test_set_build_path(open_mmap, tmp_path):
     path = Path(tmp_path / "test.set")
     build_set(path=path)
-    validate_set_file(path)
+    validate_set_file(open_mmap, path)
 
 
 def test_set_build_not_bytes():
@@ -67,57 +113,66 @@ def test_set_build_not_bytes():
         Set.build(":memory:", ["key"])
 
 
-def test_set_build_buffer_file(tmp_path):
+def test_set_build_buffer_file(open_mmap, tmp_path):
     path = tmp_path / "test.set"
     buf = build_set()
-    with open(path, 'wb') as f:
-        f.write(buf)
-    with open(path, 'rb') as f:
-        data = f.read()
-    validate_set(Set(data))
+    path.write_bytes(buf)
+    validate_set_file(open_mmap, path)
 
 
-@contextlib.contextmanager
-def init_mmap(tmp_path):
-    path = tmp_path / "test.set"
+@pytest.fixture(scope="module")
+def set_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("ducer") / "test.set"
     build_set(path=path)
-    with open(path, "rb") as fp:
-        mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
-        yield Set(mm)
+    return path
+
 
+@pytest.fixture(scope="module")
+def mmap_set_seq(open_mmap, set_file):
+    return Set(open_mmap(set_file, "sequential"))
 
-def test_set_init_mmap(tmp_path):
-    with init_mmap(tmp_path) as m:
-        pass
 
+@pytest.fixture(scope="module")
+def mmap_set_rand(open_mmap, set_file):
+    return Set(open_mmap(set_file, "random"))
 
-def test_set_len_memory():
-    m = create_set()
-    assert len(m) == 2
 
+def test_set_init_mmap(mmap_set_rand):
+    pass
 
-def test_set_len_mmap(tmp_path):
-    with init_mmap(tmp_path) as m:
-        assert len(m) == 2
 
+def test_set_len_memory(set12):
+    assert len(set12) == 2
 
-def test_set_contains():
-    m = create_set()
+
+def test_set_len_mmap(mmap_set_rand):
+    assert len(mmap_set_rand) == 2
+
+
+def test_set_contains(set12):
     for k in SET12:
-        assert k in m
-    assert K3 not in m
+        assert k in set12
+    assert K3 not in set12
+
 
+def test_set_multi_contains(set12):
+    assert multi_contains(set12, (K1, K2, K3)) == {K1, K2}
 
-def test_set_iter():
-    m = create_set()
-    for k1, k2 in zip(m, sorted(SET12)):
+
+def test_set_contains_mmap(mmap_set_rand):
+    for k in SET12:
+        assert k in mmap_set_rand
+    assert K3 not in mmap_set_rand
+
+
+def test_set_iter(set12):
+    for k1, k2 in itertools.zip_longest(set12, SET12, fillvalue=MISSING):
         assert k1 == k2
 
 
-def test_set_iter_mmap(tmp_path):
-    with init_mmap(tmp_path) as m:
-        for k1, k2 in zip(m, sorted(SET12)):
-            assert k1 == k2
+def test_set_iter_mmap(mmap_set_seq):
+    for k1, k2 in itertools.zip_longest(mmap_set_seq, SET12, fillvalue=MISSING):
+        assert k1 == k2
 
 
 def test_set_isdisjoint_true():
@@ -178,287 +233,92 @@ def test_set_eq_false_other():
     assert s != 7
 
 
-def test_set_lt_true():
-    s1 = create_set(source=SET1)
-    s2 = create_set(source=SET12)
-    assert s1 < s2
-
-
-def test_set_lt_false():
-    s1 = create_set(source=SET123)
-    s2 = create_set(source=SET123)
-    assert not s1 < s2
-
-
-def test_set_le_true():
-    s1 = create_set(source=SET123)
-    s2 = create_set(source=SET123)
-    assert s1 <= s2
-
-
-def test_set_le_false():
-    s1 = create_set(source=SET123)
-    s2 = create_set(source=SET123)
-    assert not s1 < s2
-
-
-def test_set_gt_true():
-    s1 = create_set(source=SET123)
-    s2 = create_set(source=SET23)
-    assert s1 > s2
-
-
-def test_set_gt_false():
-    s1 = create_set(source=SET123)
-    s2 = create_set(source=SET123)
-    assert not s1 > s2
-
-
-def test_set_ge_true():
-    s1 = create_set(source=SET123)
-    s2 = create_set(source=SET123)
-    assert s1 >= s2
-
-
-def test_set_ge_false():
-    s1 = create_set(source=SET12)
-    s2 = create_set(source=SET123)
-    assert not s1 >= s2
-
-
-def test_set_keys():
-    m = create_set()
-    for k1, k2 in zip(m.keys(), sorted(SET12)):
+@pytest.mark.parametrize("source1,op,source2,expected", [
+    ("set1", operator.lt, "set12", True),
+    ("set123", operator.lt, "set123", False),
+    ("set123", operator.le, "set123", True),
+    ("set123", operator.le, "set12", False),
+    ("set123", operator.gt, "set23", True),
+    ("set123", operator.gt, "set123", False),
+    ("set123", operator.ge, "set123", True),
+    ("set12", operator.ge, "set123", False),
+])
+def test_set_compare(request, source1, op, source2, expected):
+    s1 = request.getfixturevalue(source1)
+    s2 = request.getfixturevalue(source2)
+    assert op(s1, s2) is expected
+
+
+def test_set_keys(set12):
+    for k1, k2 in itertools.zip_longest(set12.keys(), SET12, fillvalue=MISSING):
         assert k1 == k2
 
 
-def test_set_range():
-    m = create_set()
-    for i1, i2 in zip(m.range(), sorted(SET12)):
+def test_set_range(set12):
+    for i1, i2 in itertools.zip_longest(set12.range(), SET12, fillvalue=MISSING):
         assert i1 == i2
 
 
-def test_set_range_lt():
-    m = create_set()
-    items = list(m.range(lt=K2))
-    assert K1 in items
-    assert K2 not in items
-
-
-def test_set_range_le():
-    m = create_set()
-    items = list(m.range(le=K1))
-    assert K1 in items
-    assert K2 not in items
-
-
-def test_set_range_gt():
-    m = create_set()
-    items = list(m.range(gt=K1))
-    assert K1 not in items
-    assert K2 in items
-
-
-def test_set_range_ge():
-    m = create_set()
-    items = list(m.range(ge=K2))
-    assert K1 not in items
-    assert K2 in items
-
-
-def test_set_range_lt_gt():
-    m = create_set()
-    items = list(m.range(lt=K2, gt=K1))
-    assert not items
-
-
-def test_set_range_le_gt():
-    m = create_set()
-    items = list(m.range(le=K2, gt=K1))
-    assert K1 not in items
-    assert K2 in items
-
-
-def test_set_range_lt_ge():
-    m = create_set()
-    items = list(m.range(lt=K2, ge=K1))
-    assert K1 in items
-    assert K2 not in items
-
-
-def test_set_search_always():
-    m = create_set()
-    a = Automaton.always()
-    items = list(m.search(a))
-    for i in SET12:
-        assert i in items
-
-
-def test_set_search_always_complement():
-    m = create_set()
-    a = Automaton.always().complement()
-    items = list(m.search(a))
-    assert not items
-
-
-def test_set_search_never():
-    m = create_set()
-    a = Automaton.never()
-    items = list(m.search(a))
-    assert not items
-
-
-def test_set_search_never_complement():
-    m = create_set()
-    a = Automaton.never().complement()
-    items = list(m.search(a))
-    for i in SET12:
-        assert i in items
-
-
-def test_set_search_str():
-    m = create_set()
-    a = Automaton.str(K1)
-    items = list(m.search(a))
-    assert K1 in items
-    assert K2 not in items
-
-
-def test_set_search_str_complement():
-    m = create_set()
-    a = Automaton.str(K1).complement()
-    items = list(m.search(a))
-    assert K1 not in items
-    assert K2 in items
-
-
-def test_set_search_subsequence():
-    m = create_set()
-    a = Automaton.subsequence(b"k1")
-    items = list(m.search(a))
-    assert K1 in items
-    assert K2 not in items
-
-
-def test_set_search_subsequence_complement():
-    m = create_set()
-    a = Automaton.subsequence(b"k1").complement()
-    items = list(m.search(a))
-    assert K1 not in items
-    assert K2 in items
-
-
-def test_set_search_hamming_subsequence():
-    m = create_set(SET123)
-    a = Automaton.hamming_subsequence(b"k2", 0)
-    items = list(m.search(a))
-    assert K1 not in items
-    assert K2 in items
-    assert K3 not in items
-    a = Automaton.hamming_subsequence(b"k2", 1)
-    items = list(m.search(a))
-    assert K1 not in items
-    assert K2 in items
-    assert K3 in items
-
-
-def test_set_search_hamming_subsequence_complement():
-    m = create_set(SET123)
-    a = Automaton.hamming_subsequence(b"k2", 0).complement()
-    items = list(m.search(a))
-    assert K1 in items
-    assert K2 not in items
-    assert K3 in items
-    a = Automaton.hamming_subsequence(b"k2", 1).complement()
-    items = list(m.search(a))
-    assert K1 in items
-    assert K2 not in items
-    assert K3 not in items
-
-
-def test_set_search_starts_with():
-    m = create_set(source=SET12O)
-    a = Automaton.str(b"key").starts_with()
-    items = list(m.search(a))
-    assert K1 in items
-    assert K2 in items
-    assert KO not in items
-
-
-def test_set_search_starts_with_complement():
-    m = create_set(source=SET12O)
-    a = Automaton.str(b"key").starts_with().complement()
-    items = list(m.search(a))
-    assert K1 not in items
-    assert K2 not in items
-    assert KO in items
-
-
-def test_set_search_union():
-    m = create_set(source=SET12O)
-    a1 = Automaton.str(K1)
-    a2 = Automaton.str(b"oth").starts_with()
-    a = a1.union(a2)
-    items = list(m.search(a))
-    assert K1 in items
-    assert K2 not in items
-    assert KO in items
-
-
-def test_set_search_intersection():
-    m = create_set(source=SET123)
-    a1 = Automaton.str(K1).complement()
-    a2 = Automaton.str(K3).complement()
-    a = a1.intersection(a2)
-    items = list(m.search(a))
-    assert K1 not in items
-    assert K2 in items
-    assert K3 not in items
-
-
-def test_set_difference():
-    m1 = create_set(source=SET123)
-    m2 = create_set(source=SET23)
-    m = Set(m1.difference(":memory:", m2))
-    items = list(m)
-    assert K1 in items
-    assert K2 not in items
-    assert K3 not in items
-
-
-def test_set_intersection():
-    m1 = create_set(source=SET12)
-    m2 = create_set(source=SET23)
-    m = Set(m1.intersection(":memory:", m2))
-    items = list(m)
-    assert K1 not in items
-    assert K2 in items
-    assert K3 not in items
-
-
-def test_set_symmetric_difference():
-    m1 = create_set(source=SET12)
-    m2 = create_set(source=SET23)
-    m = Set(m1.symmetric_difference(":memory:", m2))
-    items = list(m)
-    assert K1 in items
-    assert K2 not in items
-    assert K3 in items
-
-
-def test_set_union():
-    m1 = create_set(source=SET1)
-    m2 = create_set(source=SET23)
-    m = Set(m1.union(":memory:", m2))
+@pytest.mark.parametrize("kwargs,expected", [
+    (dict(lt=K2), (K1,)),
+    (dict(le=K1), (K1,)),
+    (dict(gt=K1), (K2,)),
+    (dict(ge=K2), (K2,)),
+    (dict(lt=K2, gt=K1), ()),
+    (dict(le=K2, gt=K1), (K2,)),
+    (dict(lt=K2, ge=K1), (K1,)),
+])
+def test_set_range_bounds(set12, kwargs, expected):
+    assert take(set12.range(**kwargs), len(expected)) == expected
+
+
+@pytest.mark.parametrize("source,automaton,expected", [
+    pytest.param("set12", A_ALWAYS, (K1, K2), id="always"),
+    pytest.param("set12", A_ALWAYS_COMPLEMENT, (), id="always_complement"),
+    pytest.param("set12", A_NEVER, (), id="never"),
+    pytest.param("set12", A_NEVER_COMPLEMENT, (K1, K2), id="never_complement"),
+    pytest.param("set12", A_STR_K1, (K1,), id="str"),
+    pytest.param("set12", A_STR_K1_COMPLEMENT, (K2,), id="str_complement"),
+    pytest.param("set12", A_SUBSEQUENCE_K1, (K1,), id="subsequence"),
+    pytest.param("set12", A_SUBSEQUENCE_K1_COMPLEMENT, (K2,), id="subsequence_complement"),
+    pytest.param("set123", A_HAMMING_K2_0, (K2,), id="hamming_subsequence_0"),
+    pytest.param("set123", A_HAMMING_K2_1, (K2, K3), id="hamming_subsequence_1"),
+    pytest.param("set123", A_HAMMING_K2_0_COMPLEMENT, (K1, K3), id="hamming_subsequence_0_complement"),
+    pytest.param("set123", A_HAMMING_K2_1_COMPLEMENT, (K1,), id="hamming_subsequence_1_complement"),
+    pytest.param("set12o", A_STARTS_WITH_KEY, (K1, K2), id="starts_with"),
+    pytest.param("set12o", A_STARTS_WITH_KEY_COMPLEMENT, (KO,), id="starts_with_complement"),
+    pytest.param("set12o", A_STR_K1_OR_STARTS_WITH_OTH, (K1, KO), id="union"),
+    pytest.param("set123", A_NOT_K1_AND_NOT_K3, (K2,), id="intersection"),
+])
+def test_set_search(request, source, automaton, expected):
+    m = request.getfixturevalue(source)
+    assert tuple(m.search(automaton)) == expected
+
+
+def test_set_difference(set123, set23):
+    items = set(Set(set123.difference(":memory:", set23)))
+    assert K1 in items and items.isdisjoint((K2, K3))
+
+
+def test_set_intersection(set12, set23):
+    items = set(Set(set12.intersection(":memory:", set23)))
+    assert K2 in items and items.isdisjoint((K1, K3))
+
+
+def test_set_symmetric_difference(set12, set23):
+    items = set(Set(set12.symmetric_difference(":memory:", set23)))
+    assert {K1, K3} <= items and K2 not in items
+
+
+def test_set_union(set1, set23):
+    m = Set(set1.union(":memory:", set23))
     assert K1 in m
     assert K2 in m
     assert K3 in m
 
 
-def test_set_union_multiple():
-    m1 = create_set(source=SET12)
-    m2 = create_set(source=SET23)
-    m = Set(m1.union(":memory:", m2))
+def test_set_union_multiple(set12, set23):
+    m = Set(set12.union(":memory:", set23))
     assert K1 in m
     assert K2 in m
     assert K3 in m